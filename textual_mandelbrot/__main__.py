@@ -48,6 +48,12 @@ class MandelbrotApp(App[None]):
 
     COMMANDS = App.COMMANDS | {MandelbrotCommands}
 
+    def __init__(self) -> None:
+        """Initialise the application."""
+        super().__init__()
+        self._last_size: tuple[tuple[int, int], tuple[int, int]] | None = None
+        """The sizes last used for the plot and the widget."""
+
     def _best_size(self) -> tuple[tuple[int, int], tuple[int, int]]:
         """Figure out the best initial size for the plot and the widget.
 
@@ -74,6 +80,11 @@ class MandelbrotApp(App[None]):
             best_height = display_height
             best_width = ((best_height // 3) * 4) * 2
 
+        # Even in the tiniest of displays, always leave room for the border
+        # and at least one cell of plot.
+        best_width = max(3, best_width)
+        best_height = max(3, best_height)
+
         # Final choice.
         return (best_width - 2, (best_height - 2) * 2), (best_width, best_height)
 
@@ -83,7 +94,8 @@ class MandelbrotApp(App[None]):
         Returns:
             The widget.
         """
-        (canvas_width, canvas_height), (widget_width, widget_height) = self._best_size()
+        self._last_size = self._best_size()
+        (canvas_width, canvas_height), (widget_width, widget_height) = self._last_size
         plot = Mandelbrot(canvas_width, canvas_height)
         plot.styles.width = widget_width
         plot.styles.height = widget_height
@@ -99,6 +111,19 @@ class MandelbrotApp(App[None]):
         """Set things up once the DOM is available."""
         self.query_one(Mandelbrot).focus()
 
+    def on_resize(self) -> None:
+        """Refit the plot to the display when the display changes size."""
+        # If the best size hasn't changed there's no sense in redrawing the
+        # whole plot.
+        if (best_size := self._best_size()) == self._last_size:
+            return
+        self._last_size = best_size
+        (canvas_width, canvas_height), (widget_width, widget_height) = best_size
+        plot = self.query_one(Mandelbrot)
+        plot.styles.width = widget_width
+        plot.styles.height = widget_height
+        plot.resize_canvas(canvas_width, canvas_height).plot()
+
     @on(Mandelbrot.Changed)
     def update_titles(self, event: Mandelbrot.Changed) -> None:
         """Handle the parameters of the Mandelbrot being changed.
@@ -0,0 +1,526 @@
+"""Calculation of the escape values for grids of points.
+
+Note:
+    Where they're available the compiled kernels are used for the
+    calculations; failing that the calculations are done with NumPy.
+"""
+
+##############################################################################
+# Python imports.
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from math import ceil
+from os import cpu_count, environ
+from threading import Event, Lock
+from types import ModuleType
+from typing import Any, Callable, Container, Tuple
+
+##############################################################################
+# NumPy imports.
+import numpy as np
+from numpy.typing import NDArray
+
+##############################################################################
+KERNEL_VARIABLE = "TEXTUAL_MANDELBROT_KERNEL"
+"""The environment variable that can be used to pick the kernel."""
+
+_KERNELS = {"cuda": "._kernel_cuda", "numba": "._kernel"}
+"""The compiled kernels that can be used, and the modules they live in."""
+
+
+##############################################################################
+def _load_kernel(failed: Container[ModuleType] = ()) -> ModuleType | None:
+    """Load the compiled kernel that should be used.
+
+    Args:
+        failed: Any kernels that have been found not to work.
+
+    Returns:
+        The module of the compiled kernel, or `None` if there isn't one.
+
+    Note:
+        By default the kernel that runs on the CPU is used. The kernel can
+        be picked by setting the environment variable named by
+        `KERNEL_VARIABLE` to `cuda`, `numba` or `numpy`; the kernel that runs
+        on a GPU is only ever used if it is asked for this way. If the
+        kernel that is asked for isn't available the usual choice is made
+        instead.
+    """
+    wanted = environ.get(KERNEL_VARIABLE, "").strip().lower()
+    if wanted == "numpy":
+        return None
+    for kernel in (wanted, "numba"):
+        if kernel in _KERNELS:
+            try:
+                module = import_module(_KERNELS[kernel], __package__)
+            except ImportError:
+                continue
+            if module not in failed:
+                return module
+    return None
+
+
+##############################################################################
+def _in_main_bulbs(
+    xs: NDArray[np.floating[Any]], ys: NDArray[np.floating[Any]]
+) -> NDArray[np.bool_]:
+    """Find the points within the main cardioid or the period-2 bulb.
+
+    Args:
+        xs: The x locations of the points to test.
+        ys: The y locations of the points to test.
+
+    Returns:
+        A mask that is `True` for points known to be in the classic
+        Mandelbrot set.
+    """
+    ys_squared = ys * ys
+    q = (xs - 0.25) ** 2 + ys_squared
+    return (q * (q + (xs - 0.25)) < 0.25 * ys_squared) | (
+        (xs + 1) ** 2 + ys_squared < 0.0625
+    )
+
+
+##############################################################################
+def _raised(
+    values: NDArray[np.complexfloating[Any, Any]], power: int
+) -> NDArray[np.complexfloating[Any, Any]]:
+    """Raise complex values to a whole power, by repeated squaring.
+
+    Args:
+        values: The values to raise.
+        power: The power to raise them to; must be at least 1.
+
+    Returns:
+        The raised values.
+
+    Note:
+        NumPy's complex power is many times slower than the handful of
+        multiplies this takes, even for whole powers.
+    """
+    # Work down through the bits of the power after the highest one.
+    result = values
+    for bit in f"{power:b}"[1:]:
+        result = result * result
+        if bit == "1":
+            result = result * values
+    return result
+
+
+##############################################################################
+_SETTLE_CHECK = 16
+"""How many iterations go by between checks for points that have settled."""
+
+_SETTLED = 1e-12
+"""The size of derivative below which a point is taken to have settled."""
+
+
+##############################################################################
+def _settled(derivative: NDArray[np.complexfloating[Any, Any]]) -> NDArray[np.bool_]:
+    """Find the points whose orbits have settled into an attracting cycle.
+
+    Args:
+        derivative: The derivatives of the orbits, less the factor of 2
+            for each of the last `_SETTLE_CHECK` iterations.
+
+    Returns:
+        A mask of the points that have settled.
+
+    Note:
+        The derivatives are updated in place; any that have grown past 1
+        are brought back down to a size of 1 so that they stay in range.
+        It's only a derivative that shrinks that is of interest.
+    """
+    derivative *= 2.0**_SETTLE_CHECK
+    size: NDArray[np.floating[Any]] = np.abs(derivative)
+    np.divide(derivative, size, out=derivative, where=size > 1)
+    return size < _SETTLED
+
+
+##############################################################################
+def _mandelbrot_tile(
+    xs: NDArray[np.floating[Any]],
+    ys: NDArray[np.floating[Any]],
+    multibrot: float,
+    max_iteration: int,
+    escapes: NDArray[np.int32],
+) -> None:
+    """Calculate the escape values for a tile of points.
+
+    Args:
+        xs: The x locations of the columns of the grid.
+        ys: The y locations of the rows of the grid.
+        multibrot: The 'multibrot' value to use in the calculation.
+        max_iteration: The maximum number of iterations to calculate for.
+        escapes: The array to place the escape values in.
+
+    Note:
+        All of the points are iterated together, with NumPy doing the work.
+        Once a point escapes it is dropped from the calculation, so the
+        amount of work done shrinks as the iterations go on. A point that
+        hasn't escaped by the time `max_iteration` is hit gets an escape
+        value of 0.
+
+        For the classic Mandelbrot set, points that fall within the main
+        cardioid or the period-2 bulb are known not to escape, so they
+        aren't iterated at all. Any other point whose orbit has been drawn
+        into an attracting cycle is spotted by the derivative of its orbit
+        shrinking towards nothing, and is dropped as not escaping. Whole
+        multibrot values are raised to with multiplies rather than with
+        NumPy's complex power.
+    """
+    values = np.zeros(len(ys) * len(xs), np.int32)
+    active = (
+        np.flatnonzero(~_in_main_bulbs(xs[np.newaxis, :], ys[:, np.newaxis]))
+        if multibrot == 2
+        else np.arange(values.size)
+    )
+    c1 = xs[active % len(xs)] + 1j * ys[active // len(xs)]
+    c2 = np.zeros_like(c1)
+    # The derivative of each orbit, less the factor of 2 per iteration that
+    # is only applied when it's checked; only tracked for the classic set.
+    derivative = np.ones_like(c1) if multibrot == 2 else None
+    # The whole power to raise to with multiplies, if there is one.
+    power = int(multibrot) if 1 <= multibrot == int(multibrot) else 0
+    for n in range(1, max_iteration):
+        if not active.size:
+            break
+        # Work in place where possible, to save on temporary arrays.
+        if power == 2:
+            np.multiply(c2, c2, out=c2)
+        else:
+            c2 = _raised(c2, power) if power else c2**multibrot
+        c2 += c1
+        done = escaped = (c2.real * c2.real + c2.imag * c2.imag) > 4
+        if derivative is not None:
+            derivative *= c2
+            if n % _SETTLE_CHECK == 0:
+                done = escaped | _settled(derivative)
+        if done.any():
+            values[active[escaped]] = n
+            still_active = ~done
+            active = active[still_active]
+            c1 = c1[still_active]
+            c2 = c2[still_active]
+            if derivative is not None:
+                derivative = derivative[still_active]
+    escapes[:] = values.reshape(len(ys), len(xs))
+
+
+##############################################################################
+_TILE_SIZE = 256
+"""The width and height of the tiles that a grid is calculated in."""
+
+_TILE_THREADS = cpu_count() or 1
+"""The number of threads the tiles of a grid are spread over."""
+
+_tile_pool = ThreadPoolExecutor(_TILE_THREADS, thread_name_prefix="mandelbrot")
+"""The pool of threads that the tiles of a grid are calculated in.
+
+Note:
+    The pool doesn't start any threads until it is first given some work.
+"""
+
+
+##############################################################################
+def mandelbrot_grid(
+    xs: NDArray[np.floating[Any]],
+    ys: NDArray[np.floating[Any]],
+    multibrot: float,
+    max_iteration: int,
+    escapes: NDArray[np.int32],
+) -> None:
+    """Calculate the escape values for a whole grid of points.
+
+    Args:
+        xs: The x locations of the columns of the grid.
+        ys: The y locations of the rows of the grid.
+        multibrot: The 'multibrot' value to use in the calculation.
+        max_iteration: The maximum number of iterations to calculate for.
+        escapes: The array to place the escape values in.
+
+    Note:
+        The grid is worked through in tiles so that the working arrays for
+        large grids stay small enough to be kind to the CPU's caches.
+
+        Where there is more than one CPU the tiles are calculated in a pool
+        of threads, with the tiles made short enough that there is at least
+        one band of rows for each thread. NumPy releases the GIL while it
+        works on the arrays, so the threads really do run side by side.
+    """
+    tile_height = min(_TILE_SIZE, max(1, ceil(len(ys) / _TILE_THREADS)))
+    tiles = [
+        (
+            xs[left : left + _TILE_SIZE],
+            ys[top : top + tile_height],
+            multibrot,
+            max_iteration,
+            escapes[top : top + tile_height, left : left + _TILE_SIZE],
+        )
+        for top in range(0, len(ys), tile_height)
+        for left in range(0, len(xs), _TILE_SIZE)
+    ]
+    if _TILE_THREADS == 1 or len(tiles) == 1:
+        for tile in tiles:
+            _mandelbrot_tile(*tile)
+    else:
+        # Consume the results so that any exception in a tile is raised here.
+        list(_tile_pool.map(_mandelbrot_tile, *zip(*tiles)))
+
+
+##############################################################################
+# The array types are quoted as subscripting np.floating needs Python 3.9.
+EscapeGrid = Callable[
+    [
+        "NDArray[np.floating[Any]]",
+        "NDArray[np.floating[Any]]",
+        float,
+        int,
+        "NDArray[np.int32]",
+    ],
+    None,
+]
+"""The type of a function that calculates the escape values for a grid."""
+
+_calculate: EscapeGrid = mandelbrot_grid
+"""The function used to calculate the escape values for a grid of points."""
+
+
+##############################################################################
+def escape_grid(
+    xs: NDArray[np.floating[Any]],
+    ys: NDArray[np.floating[Any]],
+    multibrot: float,
+    max_iteration: int,
+    escapes: NDArray[np.int32],
+) -> None:
+    """Calculate the escape values for a whole grid of points.
+
+    Args:
+        xs: The x locations of the columns of the grid.
+        ys: The y locations of the rows of the grid.
+        multibrot: The 'multibrot' value to use in the calculation.
+        max_iteration: The maximum number of iterations to calculate for.
+        escapes: The array to place the escape values in.
+
+    Note:
+        The compiled kernel is used if there is one that works, otherwise
+        the calculation is done with NumPy. If the kernel hasn't been warmed
+        up yet it is warmed up first.
+    """
+    if not escape_grid_ready.is_set():
+        warm_up()
+    _calculate(xs, ys, multibrot, max_iteration, escapes)
+
+
+escape_grid_ready = Event()
+"""Set once `escape_grid` has been warmed up and is ready to use.
+
+Note:
+    Until then the NumPy calculation is used, so that the first plot isn't
+    held up waiting on the compiler.
+"""
+
+_warming = Lock()
+"""Held while the compiled kernel is being loaded and warmed up."""
+
+
+##############################################################################
+def warm_up(
+    on_main_thread: Callable[[Callable[[], None]], object] | None = None,
+) -> None:
+    """Load the compiled kernel and get it ready to use.
+
+    Args:
+        on_main_thread: A function that runs a function on the main thread.
+
+    Note:
+        This only does anything the first time it is called. Loading a
+        compiled kernel means importing Numba, which takes a noticeable
+        amount of time, so it is put off until now rather than being done
+        when this module is imported. Some of the setting up of the kernel
+        has to happen on the main thread; if this is being called from any
+        other thread, `on_main_thread` must be given.
+
+        A kernel can load without being usable; a GPU can be found that the
+        kernel then fails to compile for, for example. If the kernel fails
+        to warm up the next choice of kernel is used in its place, with the
+        NumPy calculation as the last resort. Either way, `escape_grid_ready`
+        is set once done.
+    """
+    global _calculate  # pylint:disable=global-statement
+    with _warming:
+        if escape_grid_ready.is_set():
+            return
+        compiled = _load_kernel()
+        failed: list[ModuleType] = []
+        while compiled is not None:
+            try:
+                if on_main_thread is None:
+                    compiled.launch_threads()
+                else:
+                    on_main_thread(compiled.launch_threads)
+                compiled.warm_up()
+                break
+            except Exception:  # pylint:disable=broad-exception-caught
+                failed.append(compiled)
+                compiled = _load_kernel(failed)
+        _calculate = mandelbrot_grid if compiled is None else compiled.escape_grid
+        escape_grid_ready.set()
+
+
+SINGLE_PRECISION_LIMIT = 1e-5
+"""The smallest pixel size that can be calculated in single precision."""
+
+SINGLE_PRECISION_ITERATIONS = 200
+"""The most iterations that can be calculated in single precision."""
+
+ALIGNMENT_TOLERANCE = 1e-3
+"""How far, in pixels, positions can be from lining up and still count."""
+
+
+##############################################################################
+def mirrored_grid(
+    calculate: EscapeGrid,
+    xs: NDArray[np.floating[Any]],
+    ys: NDArray[np.floating[Any]],
+    multibrot: float,
+    max_iteration: int,
+    escapes: NDArray[np.int32],
+) -> None:
+    """Calculate the escape values for a grid, making use of its symmetry.
+
+    Args:
+        calculate: The function to calculate escape values with.
+        xs: The x locations of the columns of the grid.
+        ys: The y locations of the rows of the grid.
+        multibrot: The 'multibrot' value to use in the calculation.
+        max_iteration: The maximum number of iterations to calculate for.
+        escapes: The array to place the escape values in.
+
+    Note:
+        The set is symmetrical about the real axis. Where the grid straddles
+        it in such a way that rows above it are reflections of rows below
+        it, only the rows above are calculated; those below are copied.
+    """
+    if len(ys) > 1 and ys[-1] != ys[0]:
+        # Rows `row` and `mirror - row` are reflections of each other.
+        mirror_at = -2 * float(ys[0]) * (len(ys) - 1) / (float(ys[-1]) - float(ys[0]))
+        mirror = round(mirror_at)
+        # The first row with a reflection in the grid, and the first row on
+        # or above the real axis.
+        low, middle = max(0, mirror - (len(ys) - 1)), (mirror + 1) // 2
+        if abs(mirror_at - mirror) < ALIGNMENT_TOLERANCE and low < middle < len(ys):
+            if low:
+                calculate(xs, ys[:low], multibrot, max_iteration, escapes[:low])
+            calculate(xs, ys[middle:], multibrot, max_iteration, escapes[middle:])
+            rows = np.arange(low, middle)
+            escapes[rows] = escapes[mirror - rows]
+            return
+    calculate(xs, ys, multibrot, max_iteration, escapes)
+
+
+##############################################################################
+def refined_grid(
+    calculate: EscapeGrid,
+    xs: NDArray[np.floating[Any]],
+    ys: NDArray[np.floating[Any]],
+    multibrot: float,
+    max_iteration: int,
+    coarse: NDArray[np.int32],
+) -> NDArray[np.int32]:
+    """Calculate the escape values for a grid, given a coarser version of it.
+
+    Args:
+        calculate: The function to calculate escape values with.
+        xs: The x locations of the columns of the grid.
+        ys: The y locations of the rows of the grid.
+        multibrot: The 'multibrot' value to use in the calculation.
+        max_iteration: The maximum number of iterations to calculate for.
+        coarse: The escape values of every other row and column of the grid.
+
+    Returns:
+        The escape values for the grid.
+
+    Note:
+        The points of the coarse grid are copied across; only the other
+        three quarters of the points are calculated.
+    """
+    escapes = np.empty((len(ys), len(xs)), np.int32)
+    escapes[::2, ::2] = coarse
+    for rows, columns in (
+        (slice(1, None, 2), slice(None)),
+        (slice(0, None, 2), slice(1, None, 2)),
+    ):
+        part_xs, part_ys = xs[columns], ys[rows]
+        if len(part_xs) and len(part_ys):
+            part = np.empty((len(part_ys), len(part_xs)), np.int32)
+            mirrored_grid(
+                calculate,
+                np.ascontiguousarray(part_xs),
+                np.ascontiguousarray(part_ys),
+                multibrot,
+                max_iteration,
+                part,
+            )
+            escapes[rows, columns] = part
+    return escapes
+
+
+##############################################################################
+Pan = Tuple[NDArray[np.int32], int, int]
+"""The escape values of an earlier grid, and the columns and rows moved since."""
+
+
+##############################################################################
+def panned_grid(  # pylint:disable=too-many-locals
+    calculate: EscapeGrid,
+    xs: NDArray[np.floating[Any]],
+    ys: NDArray[np.floating[Any]],
+    multibrot: float,
+    max_iteration: int,
+    pan: Pan,
+) -> NDArray[np.int32]:
+    """Calculate the escape values for a grid that has been panned.
+
+    Args:
+        calculate: The function to calculate escape values with.
+        xs: The x locations of the columns of the grid.
+        ys: The y locations of the rows of the grid.
+        multibrot: The 'multibrot' value to use in the calculation.
+        max_iteration: The maximum number of iterations to calculate for.
+        pan: The earlier grid and how far the grid has moved from it.
+
+    Returns:
+        The escape values for the grid.
+
+    Note:
+        The part of the grid that overlaps the earlier grid is copied from
+        it; only the strips that have come into view are calculated.
+    """
+    previous, columns, rows = pan
+    height, width = previous.shape
+    escapes = np.empty_like(previous)
+    top, bottom = max(0, -rows), min(height, height - rows)
+    left, right = max(0, -columns), min(width, width - columns)
+    escapes[top:bottom, left:right] = previous[
+        top + rows : bottom + rows, left + columns : right + columns
+    ]
+    for strip_rows, strip_columns in (
+        (slice(0, top), slice(0, width)),
+        (slice(bottom, height), slice(0, width)),
+        (slice(top, bottom), slice(0, left)),
+        (slice(top, bottom), slice(right, width)),
+    ):
+        strip_xs, strip_ys = xs[strip_columns], ys[strip_rows]
+        if len(strip_xs) and len(strip_ys):
+            strip = np.empty((len(strip_ys), len(strip_xs)), np.int32)
+            mirrored_grid(
+                calculate, strip_xs, strip_ys, multibrot, max_iteration, strip
+            )
+            escapes[strip_rows, strip_columns] = strip
+    return escapes
+
+
+### _grid.py ends here
@@ -0,0 +1,523 @@
+"""Numba-compiled versions of the Mandelbrot calculations.
+
+Note:
+    This module requires [Numba](https://numba.pydata.org/), which is an
+    optional dependency. Any code importing from here should be prepared
+    for an `ImportError`.
+"""
+
+##############################################################################
+# Python imports.
+from __future__ import annotations
+from math import atan2, cos, sin
+from threading import Lock
+from typing import Any
+
+##############################################################################
+# NumPy imports.
+import numpy as np
+from numpy.typing import NDArray
+
+##############################################################################
+# Numba imports.
+from numba import get_num_threads, njit, parallel_chunksize, prange
+
+##############################################################################
+_calculating = Lock()
+"""Held while a grid is being calculated.
+
+Note:
+    Cancelling the worker that asked for a grid doesn't stop the calculation
+    of it, so a new one can be asked for while the old one is still running.
+    Numba's parallel threading layers don't all allow that, and the
+    workqueue layer aborts the whole process if it happens.
+"""
+
+
+##############################################################################
+@njit(cache=True, fastmath=True, nogil=True)
+def in_main_bulbs(x: float, y: float) -> bool:
+    """Is the point within the main cardioid or the period-2 bulb?
+
+    Args:
+        x: The x location of the point to test.
+        y: The y location of the point to test.
+
+    Returns:
+        `True` if the point is known to be in the classic Mandelbrot set.
+    """
+    y_squared = y * y
+    q = (x - 0.25) ** 2 + y_squared
+    return q * (q + (x - 0.25)) < 0.25 * y_squared or (x + 1) ** 2 + y_squared < 0.0625
+
+
+##############################################################################
+@njit(cache=True, fastmath=True, nogil=True)
+def raised(real: float, imag: float, power: int) -> tuple[float, float]:
+    """Raise a complex value, held as a pair of floats, to a whole power.
+
+    Args:
+        real: The real part of the value.
+        imag: The imaginary part of the value.
+        power: The power to raise it to; must be at least 1.
+
+    Returns:
+        The real and imaginary parts of the raised value.
+
+    Note:
+        This works down through the bits of the power, squaring as it goes,
+        so it only takes a handful of multiplies.
+    """
+    bit = 1
+    while bit * 2 <= power:
+        bit *= 2
+    result_real, result_imag = real, imag
+    bit //= 2
+    while bit:
+        result_real, result_imag = (
+            result_real * result_real - result_imag * result_imag,
+            2 * result_real * result_imag,
+        )
+        if power & bit:
+            result_real, result_imag = (
+                result_real * real - result_imag * imag,
+                result_real * imag + result_imag * real,
+            )
+        bit //= 2
+    return result_real, result_imag
+
+
+##############################################################################
+FIRST_SAMPLE = 3
+"""The iteration on which the value being iterated is first sampled.
+
+Note:
+    After this the value is sampled again each time the number of
+    iterations doubles; so on iterations 3, 6, 12, 24 and so on. If the
+    value ever lands back on the last sample taken, the point has settled
+    into a cycle and will never escape. Every compiled calculation that
+    looks out for cycles samples on this same schedule, so they all give
+    the same escape values.
+"""
+
+
+##############################################################################
+@njit(cache=True, fastmath=True, nogil=True)
+def mandel(x: float, y: float, multibrot: float, max_iteration: int) -> int:
+    """Return the Mandelbrot calculation for the point.
+
+    Args:
+        x: The x location of the point to calculate.
+        y: The y location of the point to calculate.
+        multibrot: The 'multibrot' value to use in the calculation.
+        max_iteration: The maximum number of iterations to calculate for.
+
+    Returns:
+        The number of loops to escape, or 0 if it didn't.
+
+    Note:
+        The calculation gives up early, with 0, if it finds the point has
+        settled into a cycle; see `FIRST_SAMPLE`.
+
+        The value being iterated is kept as a pair of floats rather than as
+        a complex number, so testing for escape needs no square root. Whole
+        multibrot values are raised to with multiplies; otherwise the power
+        is taken in polar form, reusing the magnitude found when testing
+        for escape.
+    """
+    if multibrot == 2.0 and in_main_bulbs(x, y):
+        return 0
+    # The whole power to raise to with multiplies, if there is one.
+    power = int(multibrot) if 1 <= multibrot == int(multibrot) else 0
+    z_real = z_imag = 0.0
+    sample_real = sample_imag = 0.0
+    sample_at = FIRST_SAMPLE
+    for n in range(max_iteration):
+        magnitude_squared = z_real * z_real + z_imag * z_imag
+        if magnitude_squared > 4.0:
+            return n
+        if power:
+            z_real, z_imag = raised(z_real, z_imag, power)
+        else:
+            # Raise z to the power in polar form, making use of the
+            # magnitude we already have to hand.
+            scale = magnitude_squared ** (multibrot / 2)
+            angle = atan2(z_imag, z_real) * multibrot
+            z_real, z_imag = scale * cos(angle), scale * sin(angle)
+        z_real += x
+        z_imag += y
+        # If we've landed back on an earlier value we're in a cycle, so
+        # the point will never escape.
+        if z_real == sample_real and z_imag == sample_imag:
+            return 0
+        if n == sample_at:
+            sample_real, sample_imag = z_real, z_imag
+            sample_at *= 2
+    return 0
+
+
+##############################################################################
+LANES = 16
+"""The number of points calculated side by side in a tile."""
+
+
+##############################################################################
+@njit(cache=True, fastmath=True, nogil=True, boundscheck=False)
+def escape_tile(
+    xs: NDArray[np.floating[Any]],
+    ys: NDArray[np.floating[Any]],
+    max_iteration: int,
+    escapes: NDArray[np.int32],
+    z_real: NDArray[np.floating[Any]],
+    z_imag: NDArray[np.floating[Any]],
+) -> None:
+    """Calculate the escape values for a tile of points in the classic set.
+
+    Args:
+        xs: The x locations of the points in the tile.
+        ys: The y locations of the points in the tile.
+        max_iteration: The maximum number of iterations to calculate for.
+        escapes: The array to place the escape values in.
+        z_real: Working space for the real parts of the values iterated.
+        z_imag: Working space for the imaginary parts of the values iterated.
+
+    Note:
+        All of the arrays must be `LANES` long. The points are iterated in
+        lockstep, with no branching within the lanes; a point that has
+        escaped simply stops being updated. This allows the compiler to
+        turn the inner loop into SIMD instructions. The escape values are
+        counted up in place as the points are iterated.
+
+        The working space is passed in, rather than made here, so that it
+        can be reused from one tile to the next instead of being allocated
+        afresh for every tile.
+
+        Points within the main cardioid or the period-2 bulb are started
+        off as if they'd already escaped, and so never get counted.
+
+        The calculation is done in the precision of the arrays given. Care
+        is taken to not mix in any other precision, as that would halve
+        the number of lanes the SIMD instructions could work on.
+    """
+    z_real[:] = 0
+    z_imag[:] = 0
+    escapes[:] = 0
+    for lane in range(LANES):
+        if in_main_bulbs(xs[lane], ys[lane]):
+            z_real[lane] = 4.0
+    for _ in range(max_iteration):
+        active = 0
+        for lane in range(LANES):
+            real_squared = z_real[lane] * z_real[lane]
+            imag_squared = z_imag[lane] * z_imag[lane]
+            inside = real_squared + imag_squared <= 4.0
+            escapes[lane] += inside
+            active += inside
+            product = z_real[lane] * z_imag[lane]
+            new_imag = product + product + ys[lane]
+            new_real = real_squared - imag_squared + xs[lane]
+            z_imag[lane] = new_imag if inside else z_imag[lane]
+            z_real[lane] = new_real if inside else z_real[lane]
+        if not active:
+            break
+    for lane in range(LANES):
+        if escapes[lane] == max_iteration:
+            escapes[lane] = 0
+
+
+##############################################################################
+@njit(cache=True, fastmath=True, nogil=True, parallel=True)
+def _escape_rows(
+    xs: NDArray[np.floating[Any]],
+    ys: NDArray[np.floating[Any]],
+    max_iteration: int,
+    escapes: NDArray[np.int32],
+) -> None:
+    """Calculate the escape values for the rows of a grid in the classic set.
+
+    Args:
+        xs: The x locations of the columns of the grid.
+        ys: The y locations of the rows of the grid.
+        max_iteration: The maximum number of iterations to calculate for.
+        escapes: The array to place the escape values in.
+
+    Note:
+        The rows of the grid are spread over all available threads, and
+        each row is worked through in tiles of `LANES` points.
+    """
+    width = xs.shape[0]
+    for y_pixel in prange(ys.shape[0]):  # pylint:disable=not-an-iterable
+        tile_xs = np.empty(LANES, xs.dtype)
+        tile_ys = np.full(LANES, ys[y_pixel])
+        tile_escapes = np.empty(LANES, np.int32)
+        # Working space for the tiles, reused for every tile in the row.
+        z_real, z_imag = np.empty_like(tile_xs), np.empty_like(tile_xs)
+        for x_pixel in range(0, width, LANES):
+            # Pad out the last tile in the row by repeating the last point.
+            for lane in range(LANES):
+                tile_xs[lane] = xs[min(x_pixel + lane, width - 1)]
+            escape_tile(tile_xs, tile_ys, max_iteration, tile_escapes, z_real, z_imag)
+            for lane in range(min(LANES, width - x_pixel)):
+                escapes[y_pixel, x_pixel + lane] = tile_escapes[lane]
+
+
+##############################################################################
+BLOCK_SIZE = 64
+"""The width and height of the blocks a multibrot grid is calculated in."""
+
+SUBDIVIDE_LIMIT = 8
+"""The smallest width or height of a rectangle that is worth subdividing."""
+
+
+##############################################################################
+@njit(cache=True, fastmath=True, nogil=True)
+def _escape_rectangle(
+    xs: NDArray[np.floating[Any]],
+    ys: NDArray[np.floating[Any]],
+    multibrot: float,
+    max_iteration: int,
+    escapes: NDArray[np.int32],
+    rectangle: tuple[int, int, int, int],
+) -> None:
+    """Calculate the escape values for every point in a rectangle of a grid.
+
+    Args:
+        xs: The x locations of the columns of the grid.
+        ys: The y locations of the rows of the grid.
+        multibrot: The 'multibrot' value to use in the calculation.
+        max_iteration: The maximum number of iterations to calculate for.
+        escapes: The array to place the escape values in.
+        rectangle: The top, left, bottom and right of the rectangle.
+    """
+    top, left, bottom, right = rectangle
+    for y_pixel in range(top, bottom):
+        for x_pixel in range(left, right):
+            escapes[y_pixel, x_pixel] = mandel(
+                xs[x_pixel], ys[y_pixel], multibrot, max_iteration
+            )
+
+
+##############################################################################
+@njit(cache=True, fastmath=True, nogil=True)
+def _is_uniform(
+    escapes: NDArray[np.int32], rectangle: tuple[int, int, int, int]
+) -> bool:
+    """Does the border of a rectangle of a grid all have the same value?
+
+    Args:
+        escapes: The escape values of the grid.
+        rectangle: The top, left, bottom and right of the rectangle.
+
+    Returns:
+        `True` if the whole border has the same escape value.
+    """
+    top, left, bottom, right = rectangle
+    value = escapes[top, left]
+    for x_pixel in range(left, right):
+        if escapes[top, x_pixel] != value or escapes[bottom - 1, x_pixel] != value:
+            return False
+    for y_pixel in range(top + 1, bottom - 1):
+        if escapes[y_pixel, left] != value or escapes[y_pixel, right - 1] != value:
+            return False
+    return True
+
+
+##############################################################################
+@njit(cache=True, fastmath=True, nogil=True)
+def _surrounds_origin(
+    xs: NDArray[np.floating[Any]],
+    ys: NDArray[np.floating[Any]],
+    rectangle: tuple[int, int, int, int],
+) -> bool:
+    """Does a rectangle of a grid take in the origin?
+
+    Args:
+        xs: The x locations of the columns of the grid.
+        ys: The y locations of the rows of the grid.
+        rectangle: The top, left, bottom and right of the rectangle.
+
+    Returns:
+        `True` if the origin lies within the rectangle.
+    """
+    top, left, bottom, right = rectangle
+    return bool(xs[left] <= 0 <= xs[right - 1] and ys[top] <= 0 <= ys[bottom - 1])
+
+
+##############################################################################
+@njit(cache=True, fastmath=True, nogil=True)
+def escape_block(  # pylint:disable=too-many-locals
+    xs: NDArray[np.floating[Any]],
+    ys: NDArray[np.floating[Any]],
+    multibrot: float,
+    max_iteration: int,
+    escapes: NDArray[np.int32],
+) -> None:
+    """Calculate the escape values for a block of points.
+
+    Args:
+        xs: The x locations of the columns of the block.
+        ys: The y locations of the rows of the block.
+        multibrot: The 'multibrot' value to use in the calculation.
+        max_iteration: The maximum number of iterations to calculate for.
+        escapes: The array to place the escape values in.
+
+    Note:
+        This is the Mariani-Silver algorithm. The areas of the plot that
+        share an escape value can't have holes in them, so if the border of
+        a rectangle all has the same escape value so does its inside, unless
+        the whole of the set is inside it. Only
+        the border is calculated; if it isn't all one value a row and a
+        column through the middle are calculated, which split the rectangle
+        into four smaller ones whose borders are known.
+    """
+    height, width = escapes.shape
+    for border in (
+        (0, 0, 1, width),
+        (height - 1, 0, height, width),
+        (1, 0, height - 1, 1),
+        (1, width - 1, height - 1, width),
+    ):
+        _escape_rectangle(xs, ys, multibrot, max_iteration, escapes, border)
+    # The rectangles whose border is known but whose inside isn't.
+    rectangles = [(0, 0, height, width)]
+    while rectangles:
+        top, left, bottom, right = rectangle = rectangles.pop()
+        # A border of points outside the set can still go all the way round
+        # it, when zoomed out far enough, so there's no filling in any
+        # rectangle that could have the set inside it.
+        if _is_uniform(escapes, rectangle) and (
+            escapes[top, left] == 0 or not _surrounds_origin(xs, ys, rectangle)
+        ):
+            escapes[top + 1 : bottom - 1, left + 1 : right - 1] = escapes[top, left]
+        elif min(bottom - top, right - left) < SUBDIVIDE_LIMIT:
+            _escape_rectangle(
+                xs,
+                ys,
+                multibrot,
+                max_iteration,
+                escapes,
+                (top + 1, left + 1, bottom - 1, right - 1),
+            )
+        else:
+            row, column = (top + bottom) // 2, (left + right) // 2
+            for middle in (
+                (row, left + 1, row + 1, right - 1),
+                (top + 1, column, bottom - 1, column + 1),
+            ):
+                _escape_rectangle(xs, ys, multibrot, max_iteration, escapes, middle)
+            rectangles.extend(
+                [
+                    (top, left, row + 1, column + 1),
+                    (top, column, row + 1, right),
+                    (row, left, bottom, column + 1),
+                    (row, column, bottom, right),
+                ]
+            )
+
+
+##############################################################################
+@njit(cache=True, fastmath=True, nogil=True, parallel=True)
+def _escape_blocks(
+    xs: NDArray[np.floating[Any]],
+    ys: NDArray[np.floating[Any]],
+    multibrot: float,
+    max_iteration: int,
+    escapes: NDArray[np.int32],
+) -> None:
+    """Calculate the escape values for the blocks of a grid of points.
+
+    Args:
+        xs: The x locations of the columns of the grid.
+        ys: The y locations of the rows of the grid.
+        multibrot: The 'multibrot' value to use in the calculation.
+        max_iteration: The maximum number of iterations to calculate for.
+        escapes: The array to place the escape values in.
+
+    Note:
+        The grid is cut into blocks of `BLOCK_SIZE` points, which are
+        spread over all available threads.
+    """
+    height, width = escapes.shape
+    columns = (width + BLOCK_SIZE - 1) // BLOCK_SIZE
+    rows = (height + BLOCK_SIZE - 1) // BLOCK_SIZE
+    for block in prange(rows * columns):  # pylint:disable=not-an-iterable
+        top, left = (block // columns) * BLOCK_SIZE, (block % columns) * BLOCK_SIZE
+        bottom, right = min(height, top + BLOCK_SIZE), min(width, left + BLOCK_SIZE)
+        escape_block(
+            xs[left:right],
+            ys[top:bottom],
+            multibrot,
+            max_iteration,
+            escapes[top:bottom, left:right],
+        )
+
+
+##############################################################################
+def escape_grid(
+    xs: NDArray[np.floating[Any]],
+    ys: NDArray[np.floating[Any]],
+    multibrot: float,
+    max_iteration: int,
+    escapes: NDArray[np.int32],
+) -> None:
+    """Calculate the escape values for a whole grid of points.
+
+    Args:
+        xs: The x locations of the columns of the grid.
+        ys: The y locations of the rows of the grid.
+        multibrot: The 'multibrot' value to use in the calculation.
+        max_iteration: The maximum number of iterations to calculate for.
+        escapes: The array to place the escape values in.
+
+    Note:
+        How long a row or a block takes depends on how much of it is close
+        to the set, so they are handed out to the threads one at a time
+        rather than in even batches; otherwise whichever threads got the
+        work through the middle of the set would be left doing most of it.
+
+        The classic set is calculated a row at a time in SIMD tiles, which
+        is quick enough that skipping areas of one value doesn't pay for
+        itself. Any other multibrot is far slower to calculate point by
+        point, so it is worked through in blocks that skip those areas.
+    """
+    with _calculating, parallel_chunksize(1):
+        if multibrot == 2.0:
+            _escape_rows(xs, ys, max_iteration, escapes)
+        else:
+            _escape_blocks(xs, ys, multibrot, max_iteration, escapes)
+
+
+##############################################################################
+def launch_threads() -> None:
+    """Get the threads the calculations are spread over launched.
+
+    Note:
+        This should be called on the main thread, before anything else is
+        used. If the threads are first launched from within a worker thread
+        the TBB threading layer can leave the application hanging on exit.
+    """
+    get_num_threads()
+
+
+##############################################################################
+def warm_up() -> None:
+    """Ensure the compiled functions are ready to use.
+
+    The first call to a Numba function triggers its compilation (or the
+    loading of it from the cache), which can take a noticeable amount of
+    time. Calling this ahead of time gets that cost out of the way. It is
+    safe to call this from a worker thread, even while a grid is being
+    calculated.
+    """
+    for dtype in (np.float32, np.float64):
+        for multibrot in (2.0, 3.0):
+            escape_grid(
+                np.zeros(1, dtype),
+                np.zeros(1, dtype),
+                multibrot,
+                1,
+                np.zeros((1, 1), np.int32),
+            )
+
+
+### _kernel.py ends here
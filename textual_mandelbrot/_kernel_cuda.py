@@ -0,0 +1,173 @@
+"""CUDA versions of the Mandelbrot calculations.
+
+Note:
+    This module requires [Numba](https://numba.pydata.org/), which is an
+    optional dependency, and a CUDA-capable GPU. If either isn't available
+    importing this module raises an `ImportError`.
+"""
+
+##############################################################################
+# Python imports.
+from __future__ import annotations
+from math import ceil
+from typing import Any
+
+##############################################################################
+# NumPy imports.
+import numpy as np
+from numpy.typing import NDArray
+
+##############################################################################
+# Numba imports.
+from numba import cuda
+
+##############################################################################
+# Local imports. Numba compiles the CPU kernel's functions for the GPU when
+# they're called from the functions here.
+from ._kernel import FIRST_SAMPLE, in_main_bulbs, mandel
+
+##############################################################################
+# Only go any further if there's a GPU to make use of.
+if not cuda.is_available():  # type: ignore[no-untyped-call]
+    raise ImportError("CUDA is not available")
+
+##############################################################################
+BLOCK_SIZE = 16
+"""The width and height of the blocks of threads the grid is calculated in."""
+
+
+##############################################################################
+@cuda.jit(device=True, cache=True)  # type: ignore
+def _escape_classic(x: float, y: float, max_iteration: int) -> int:
+    """Calculate the escape value for a point in the classic set.
+
+    Args:
+        x: The x location of the point to calculate.
+        y: The y location of the point to calculate.
+        max_iteration: The maximum number of iterations to calculate for.
+
+    Returns:
+        The number of loops to escape, or 0 if it didn't.
+
+    Note:
+        The value being iterated is kept as a pair of floats, in the same
+        precision as the point, so the squares of its parts can be used
+        both to test for escape and to work out the next value.
+
+        The calculation gives up early, with 0, if it finds the point has
+        settled into a cycle; see `FIRST_SAMPLE`.
+    """
+    # The check for cycles is the same as in `mandel`, by design.
+    # pylint:disable=duplicate-code
+    z_real = z_imag = sample_real = sample_imag = x - x
+    sample_at = FIRST_SAMPLE
+    for n in range(max_iteration):
+        real_squared = z_real * z_real
+        imag_squared = z_imag * z_imag
+        if real_squared + imag_squared > 4:
+            return n
+        product = z_real * z_imag
+        z_real, z_imag = real_squared - imag_squared + x, product + product + y
+        # If we've landed back on an earlier value we're in a cycle, so the
+        # point will never escape.
+        if z_real == sample_real and z_imag == sample_imag:
+            return 0
+        if n == sample_at:
+            sample_real, sample_imag = z_real, z_imag
+            sample_at *= 2
+    return 0
+
+
+##############################################################################
+@cuda.jit(cache=True)  # type: ignore
+def _escape_kernel(
+    xs: NDArray[np.floating[Any]],
+    ys: NDArray[np.floating[Any]],
+    multibrot: float,
+    max_iteration: int,
+    escapes: NDArray[np.int32],
+) -> None:
+    """Calculate the escape value for the point belonging to this thread.
+
+    The calculation gives up early, with 0, if it finds the point has
+    settled into a cycle.
+
+    Args:
+        xs: The x locations of the columns of the grid.
+        ys: The y locations of the rows of the grid.
+        multibrot: The 'multibrot' value to use in the calculation.
+        max_iteration: The maximum number of iterations to calculate for.
+        escapes: The array to place the escape values in.
+    """
+    # pylint:disable=unbalanced-tuple-unpacking,no-value-for-parameter,comparison-with-callable
+    x_pixel, y_pixel = cuda.grid(2)  # type: ignore[attr-defined]
+    if y_pixel >= escapes.shape[0] or x_pixel >= escapes.shape[1]:
+        return
+    x, y = xs[x_pixel], ys[y_pixel]
+    if multibrot != 2.0:
+        escapes[y_pixel, x_pixel] = mandel(x, y, multibrot, max_iteration)
+    elif in_main_bulbs(x, y):
+        escapes[y_pixel, x_pixel] = 0
+    else:
+        escapes[y_pixel, x_pixel] = _escape_classic(x, y, max_iteration)
+
+
+##############################################################################
+def escape_grid(
+    xs: NDArray[np.floating[Any]],
+    ys: NDArray[np.floating[Any]],
+    multibrot: float,
+    max_iteration: int,
+    escapes: NDArray[np.int32],
+) -> None:
+    """Calculate the escape values for a whole grid of points.
+
+    Args:
+        xs: The x locations of the columns of the grid.
+        ys: The y locations of the rows of the grid.
+        multibrot: The 'multibrot' value to use in the calculation.
+        max_iteration: The maximum number of iterations to calculate for.
+        escapes: The array to place the escape values in.
+
+    Note:
+        Each point of the grid is calculated by its own thread on the GPU.
+        Where possible the escape values are copied from the GPU straight
+        into `escapes`, rather than by way of an array of their own.
+    """
+    device_escapes = cuda.device_array(escapes.shape, np.int32)
+    _escape_kernel[
+        (ceil(len(xs) / BLOCK_SIZE), ceil(len(ys) / BLOCK_SIZE)),
+        (BLOCK_SIZE, BLOCK_SIZE),
+    ](cuda.to_device(xs), cuda.to_device(ys), multibrot, max_iteration, device_escapes)
+    if escapes.flags.c_contiguous:
+        device_escapes.copy_to_host(escapes)
+    else:
+        escapes[:] = device_escapes.copy_to_host()
+
+
+##############################################################################
+def launch_threads() -> None:
+    """Get the threads the calculations are spread over launched.
+
+    Note:
+        The calculations are spread over the threads of the GPU, so there's
+        nothing to launch; this is here so that every kernel can be treated
+        the same.
+    """
+
+
+##############################################################################
+def warm_up() -> None:
+    """Ensure the compiled functions are ready to use.
+
+    The first call to a CUDA kernel triggers its compilation, which can
+    take a noticeable amount of time. Calling this ahead of time gets that
+    cost out of the way.
+    """
+    for dtype in (np.float32, np.float64):
+        escape_grid(
+            np.zeros(1, dtype), np.zeros(1, dtype), 2.0, 1, np.zeros((1, 1), np.int32)
+        )
+
+
+### _kernel_cuda.py ends here
@@ -2,7 +2,14 @@
 
 ##############################################################################
 # Python imports.
+from __future__ import annotations
 from functools import lru_cache
+from typing import Callable
+
+##############################################################################
+# NumPy imports.
+import numpy as np
+from numpy.typing import NDArray
 
 ##############################################################################
 # Textual imports.
@@ -10,7 +17,6 @@ from textual.color import Color
 
 
 ##############################################################################
-@lru_cache()
 def default_map(value: int, max_iteration: int) -> Color:
     """Calculate a colour for an escape value.
 
@@ -23,6 +29,91 @@ def default_map(value: int, max_iteration: int) -> Color:
     return Color.from_hsl(value / max_iteration, 1, 0.5 if value else 0)
 
 
+##############################################################################
+def _hue_to_component(
+    low: NDArray[np.float64], high: NDArray[np.float64], hue: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """Calculate one RGB component from a hue.
+
+    Args:
+        low: The low end of the component range.
+        high: The high end of the component range.
+        hue: The hue, offset for the component being calculated.
+
+    Returns:
+        The value of the component, in the range 0 to 1.
+
+    Note:
+        This is a vectorised version of the helper in the standard library's
+        `colorsys`, and so gives identical results.
+    """
+    hue = hue % 1.0
+    return np.select(
+        [hue < 1.0 / 6.0, hue < 0.5, hue < 2.0 / 3.0],
+        [
+            low + (high - low) * hue * 6.0,
+            high,
+            low + (high - low) * (2.0 / 3.0 - hue) * 6.0,
+        ],
+        low,
+    )
+
+
+##############################################################################
+def hsl_to_rgb(
+    hue: NDArray[np.float64],
+    saturation: NDArray[np.float64],
+    lightness: NDArray[np.float64],
+) -> NDArray[np.uint8]:
+    """Convert arrays of HSL values into RGB values.
+
+    Args:
+        hue: The hues to convert.
+        saturation: The saturations to convert.
+        lightness: The lightnesses to convert.
+
+    Returns:
+        An array of RGB values, one row of three components per colour.
+
+    Note:
+        The results are the same as those of `Color.from_hsl`.
+    """
+    high = np.where(
+        lightness <= 0.5,
+        lightness * (1.0 + saturation),
+        lightness + saturation - (lightness * saturation),
+    )
+    low = 2.0 * lightness - high
+    rgb = np.stack(
+        [
+            _hue_to_component(low, high, hue + 1.0 / 3.0),
+            _hue_to_component(low, high, hue),
+            _hue_to_component(low, high, hue - 1.0 / 3.0),
+        ],
+        axis=-1,
+    )
+    rgb[saturation == 0.0] = lightness[saturation == 0.0, None]
+    return (rgb * 255 + 0.5).astype(np.uint8)
+
+
+##############################################################################
+def default_palette(max_iteration: int) -> NDArray[np.uint8]:
+    """Calculate the RGB values of the default map for all escape values.
+
+    Args:
+        max_iteration: The maximum number of iterations being calculated.
+
+    Returns:
+        An array of RGB values, indexed by escape value.
+    """
+    values = np.arange(max_iteration + 1)
+    return hsl_to_rgb(
+        values / max_iteration,
+        np.ones(len(values)),
+        np.where(values > 0, 0.5, 0.0),
+    )
+
+
 ##############################################################################
 # https://stackoverflow.com/a/16505538/2123348
 BLUE_BROWN = [
@@ -46,7 +137,6 @@ BLUE_BROWN = [
 
 
 ##############################################################################
-@lru_cache()
 def blue_brown_map(value: int, _: int) -> Color:
     """Calculate a colour for an escape value.
 
@@ -63,7 +153,6 @@ def blue_brown_map(value: int, _: int) -> Color:
 GREENS = [Color(0, n * 16, 0) for n in range(16)]
 
 
-@lru_cache()
 def shades_of_green(value: int, _: int) -> Color:
     """Calculate a colour for an escape value.
 
@@ -76,4 +165,36 @@ def shades_of_green(value: int, _: int) -> Color:
     return GREENS[value % 16]
 
 
+##############################################################################
+@lru_cache(maxsize=16)
+def build_lut(
+    colour_source: Callable[[int, int], Color], max_iteration: int
+) -> NDArray[np.object_]:
+    """Build a lookup table of colours for all possible escape values.
+
+    Args:
+        colour_source: The function that provides the colours.
+        max_iteration: The maximum number of iterations being calculated.
+
+    Returns:
+        An array of colours, indexed by escape value.
+
+    Note:
+        As the table is a NumPy array, a whole grid of escape values can be
+        turned into a grid of colours in one go with `lut[escapes]`.
+
+        Recently built tables are kept, so stepping back and forth between
+        iteration counts or colour sources doesn't rebuild them. Because of
+        this the table is read-only.
+    """
+    colours = (
+        (Color(*rgb) for rgb in default_palette(max_iteration).tolist())
+        if colour_source is default_map
+        else (colour_source(value, max_iteration) for value in range(max_iteration + 1))
+    )
+    lut = np.fromiter(colours, dtype=object, count=max_iteration + 1)
+    lut.flags.writeable = False
+    return lut
+
+
 ### colouring.py ends here
@@ -2,8 +2,9 @@
 
 ##############################################################################
 # Python imports.
+from __future__ import annotations
 from functools import partial
-from typing import Callable, Iterator
+from typing import Callable, ClassVar, Tuple
 
 ##############################################################################
 # Textual imports.
@@ -15,31 +16,50 @@ from textual.command import DiscoveryHit, Hit, Hits, Provider
 from .colouring import default_map, blue_brown_map, shades_of_green
 from .mandelbrot import Mandelbrot
 
-
 ##############################################################################
-class MandelbrotCommands(Provider):
-    """A source of command palette commands for the Mandelbrot widget."""
+ColourCommand = Tuple[str, Callable[[int, int], Color], str]
+"""The type of a colour command: the command, the colour source and help."""
+
+ActionCommand = Tuple[str, str, str]
+"""The type of an action command: the command, the action and help."""
 
-    PREFIX = "Mandelbrot: "
-    """Prefix that is common to all the commands."""
 
-    @classmethod
-    def _colour_commands(cls) -> Iterator[tuple[str, Callable[[int, int], Color], str]]:
-        """The colour commands."""
+##############################################################################
+def _colour_commands(prefix: str) -> tuple[ColourCommand, ...]:
+    """Build the colour commands.
+
+    Args:
+        prefix: The prefix for the commands.
+
+    Returns:
+        The colour commands.
+    """
+    return tuple(
+        (
+            f"{prefix}Set the colour map to {colour} ",
+            source,
+            f"Set the Mandelbrot colour palette to {colour}",
+        )
         for colour, source in (
             ("default", default_map),
             ("blue/brown", blue_brown_map),
             ("green", shades_of_green),
-        ):
-            yield (
-                f"{cls.PREFIX}Set the colour map to {colour} ",
-                source,
-                f"Set the Mandelbrot colour palette to {colour}",
-            )
+        )
+    )
 
-    @classmethod
-    def _action_commands(cls) -> Iterator[tuple[str, str, str]]:
-        # Spin out some commands based around available actions.
+
+##############################################################################
+def _action_commands(prefix: str) -> tuple[ActionCommand, ...]:
+    """Build the action commands.
+
+    Args:
+        prefix: The prefix for the commands.
+
+    Returns:
+        The action commands.
+    """
+    return tuple(
+        (f"{prefix}{command}", action, help_text)
         for command, action, help_text in (
             (
                 "Fast zoom in",
@@ -75,8 +95,45 @@ class MandelbrotCommands(Provider):
                 "max_iter(-100)",
                 "Remove detail from the Mandelbrot set (will run faster)",
             ),
-        ):
-            yield (f"{cls.PREFIX}{command}", action, help_text)
+        )
+    )
+
+
+##############################################################################
+class MandelbrotCommands(Provider):
+    """A source of command palette commands for the Mandelbrot widget."""
+
+    PREFIX = "Mandelbrot: "
+    """Prefix that is common to all the commands."""
+
+    _COLOUR_COMMANDS: ClassVar[tuple[ColourCommand, ...]] = _colour_commands(PREFIX)
+    """The colour commands."""
+
+    _ACTION_COMMANDS: ClassVar[tuple[ActionCommand, ...]] = _action_commands(PREFIX)
+    """The action commands."""
+
+    _LETTERS: ClassVar[dict[str, frozenset[str]]] = {
+        command: frozenset(command.lower())
+        for command, *_ in _COLOUR_COMMANDS + _ACTION_COMMANDS
+    }
+    """The letters used in each of the commands."""
+
+    def _could_match(self, letters: set[str], command: str) -> bool:
+        """Could the given letters possibly match a command?
+
+        Args:
+            letters: The letters of the query, in lower case.
+            command: The command to check.
+
+        Returns:
+            `True` if all of the letters appear in the command.
+
+        Note:
+            This is a cheap test to perform before doing a fuzzy match; a
+            fuzzy match needs every letter of the query to be in the
+            command, so if they aren't there's no point in trying.
+        """
+        return letters <= self._LETTERS[command]
 
     async def discover(self) -> Hits:
         """Handle a request to discover commands.
@@ -91,7 +148,7 @@ class MandelbrotCommands(Provider):
             return
 
         # Spin out some commands for setting the colours.
-        for command, source, help_text in self._colour_commands():
+        for command, source, help_text in self._COLOUR_COMMANDS:
             yield DiscoveryHit(
                 command,
                 partial(self.focused.set_colour_source, source),
@@ -100,7 +157,7 @@ class MandelbrotCommands(Provider):
             )
 
         # Spin out the action commands.
-        for command, action, help_text in self._action_commands():
+        for command, action, help_text in self._ACTION_COMMANDS:
             yield DiscoveryHit(
                 command,
                 partial(self.focused.run_action, action),
@@ -123,11 +180,15 @@ class MandelbrotCommands(Provider):
         if not isinstance(self.focused, Mandelbrot):
             return
 
-        # Get a fuzzy matcher for looking for hits.
+        # Get a fuzzy matcher for looking for hits, and the letters being
+        # looked for.
         matcher = self.matcher(query)
+        letters = set(query.lower())
 
         # Spin out some commands for setting the colours.
-        for command, source, help_text in self._colour_commands():
+        for command, source, help_text in self._COLOUR_COMMANDS:
+            if not self._could_match(letters, command):
+                continue
             match = matcher.match(command)
             if match:
                 yield Hit(
@@ -138,7 +199,9 @@ class MandelbrotCommands(Provider):
                 )
 
         # Spin out the action commands.
-        for command, action, help_text in self._action_commands():
+        for command, action, help_text in self._ACTION_COMMANDS:
+            if not self._could_match(letters, command):
+                continue
             match = matcher.match(command)
             if match:
                 yield Hit(
@@ -3,17 +3,33 @@
 ##############################################################################
 # Python imports.
 from __future__ import annotations
+from collections import OrderedDict, defaultdict
 from decimal import Decimal
-from operator import mul, truediv
+from math import ceil, isclose
 from time import monotonic
-from typing import Iterator, Callable
+from typing import Any, Callable, Iterable, NamedTuple
 from typing_extensions import Self
 
+##############################################################################
+# NumPy imports.
+import numpy as np
+from numpy.typing import NDArray
+
+##############################################################################
+# Rich imports.
+from rich.segment import Segment
+from rich.style import Style
+
 ##############################################################################
 # Textual imports.
+from textual import work
 from textual.binding import Binding
 from textual.color import Color
+from textual.geometry import Size
 from textual.message import Message
+from textual.strip import Strip
+from textual.timer import Timer
+from textual.worker import get_current_worker
 
 ##############################################################################
 # Textual-canvas imports.
@@ -21,38 +37,48 @@ from textual_canvas import Canvas
 
 ##############################################################################
 # Local imports.
-from .colouring import default_map
+from ._grid import (
+    ALIGNMENT_TOLERANCE,
+    Pan,
+    SINGLE_PRECISION_ITERATIONS,
+    SINGLE_PRECISION_LIMIT,
+    escape_grid,
+    escape_grid_ready,
+    mandelbrot_grid,
+    mirrored_grid,
+    panned_grid,
+    refined_grid,
+    warm_up,
+)
+from .colouring import build_lut, default_map
 
 
 ##############################################################################
-def _mandelbrot(x: Decimal, y: Decimal, multibrot: float, max_iteration: int) -> int:
-    """Return the Mandelbrot calculation for the point.
-
-    Args:
-        x: The x location of the point to calculate.
-        y: The y location of the point to calculate.
-        multibrot: The 'multibrot' value to use in the calculation.
-        max_iteration: The maximum number of iterations to calculate for.
-
-    Returns:
-        The number of loops to escape, or 0 if it didn't.
-
-    Note:
-        The point is considered to be stable, considered to have not
-        escaped, if the `max_iteration` has been hit without the calculation
-        going above 2.0.
-    """
-    c1 = complex(x, y)
-    c2 = 0j
-    for n in range(max_iteration):
-        if abs(c2) > 2:
-            return n
-        c2 = c1 + (c2**multibrot)
-    return 0
+class _Plot(NamedTuple):
+    """The details of what a plot is of."""
+
+    from_x: float
+    """Start X position for the plot."""
+    to_x: float
+    """End X position for the plot."""
+    from_y: float
+    """Start Y position for the plot."""
+    to_y: float
+    """End Y position for the plot."""
+    width: int
+    """The width of the plot."""
+    height: int
+    """The height of the plot."""
+    multibrot: float
+    """The 'multibrot' value."""
+    max_iteration: int
+    """Maximum number of iterations to perform."""
+    precision: int
+    """The size, in bytes, of the floats the plot is calculated with."""
 
 
 ##############################################################################
-class Mandelbrot(Canvas):
+class Mandelbrot(Canvas):  # pylint:disable=too-many-instance-attributes
     """A Mandelbrot-plotting widget."""
 
     DEFAULT_CSS = """
@@ -103,6 +129,26 @@ class Mandelbrot(Canvas):
     ]
     """Keyboard bindings for the widget."""
 
+    _PROGRESSIVE_STEPS = (8, 4, 2)
+    """The pixel steps of the coarse passes made when plotting progressively.
+
+    Note:
+        Each step must be twice the one after it, so that each pass can make
+        use of the points already calculated by the pass before it.
+    """
+
+    _PROGRESSIVE_THRESHOLD = 0.1
+    """The plot time, in seconds, above which plotting is done progressively."""
+
+    _REMEMBERED_PLOTS = 8
+    """The number of recent plots whose escape values are kept to hand."""
+
+    _PLOT_DELAY = 0.03
+    """How long, in seconds, changes to the view are gathered up before a plot."""
+
+    _MINIMUM_PIXEL_ULPS = 4
+    """The fewest representable steps a pixel can span before zooming in stops."""
+
     class Changed(Message):
         """Message sent when the range of the display changes.
 
@@ -153,18 +199,36 @@ class Mandelbrot(Canvas):
         )
         self._max_iteration: int = 80
         """Maximum number of iterations to perform."""
-        self._multibrot: Decimal = Decimal(2.0)
+        self._multibrot = 2.0
         """The 'multibrot' value."""
-        self._from_x: Decimal = Decimal(-2.5)
+        self._from_x = -2.5
         """Start X position for the plot."""
-        self._to_x: Decimal = Decimal(1.5)
+        self._to_x = 1.5
         """End X position for the plot."""
-        self._from_y: Decimal = Decimal(-1.5)
+        self._from_y = -1.5
         """Start Y position for the plot."""
-        self._to_y: Decimal = Decimal(1.5)
+        self._to_y = 1.5
         """End Y position for the plot."""
         self._colour_source = colour_source
         """Source of colour for the plot."""
+        self._lut = build_lut(colour_source, self._max_iteration)
+        """Lookup table of colours for each escape value."""
+        self._slow = False
+        """Was the last plot slow enough to warrant progressive plotting?"""
+        self._axes_view: tuple[float, ...] = ()
+        """The view that the cached axes were calculated for."""
+        self._axes_cache: tuple[
+            NDArray[np.floating[Any]], NDArray[np.floating[Any]]
+        ] = (np.empty(0), np.empty(0))
+        """The cached coordinates of the columns and rows of the plot."""
+        self._remembered: OrderedDict[_Plot, NDArray[np.int32]] = OrderedDict()
+        """The escape values of recent plots, keyed by what was plotted."""
+        self._lines: list[Strip] | None = None
+        """The lines of the display showing the plot, if they're current."""
+        self._plot_timer: Timer | None = None
+        """The timer for a plot that is waiting to happen, if there is one."""
+        self._generation = 0
+        """The count of plots started; identifies the one that should show."""
 
     @property
     def max_iteration(self) -> int:
@@ -174,27 +238,27 @@ class Mandelbrot(Canvas):
     @property
     def multibrot(self) -> Decimal:
         """The 'multibrot' value."""
-        return self._multibrot
+        return Decimal(self._multibrot)
 
     @property
     def from_x(self) -> Decimal:
         """Start X position for the plot."""
-        return self._from_x
+        return Decimal(self._from_x)
 
     @property
     def to_x(self) -> Decimal:
         """End X position for the plot."""
-        return self._to_x
+        return Decimal(self._to_x)
 
     @property
     def from_y(self) -> Decimal:
         """Start Y position for the plot."""
-        return self._from_y
+        return Decimal(self._from_y)
 
     @property
     def to_y(self) -> Decimal:
         """End Y position for the plot."""
-        return self._to_y
+        return Decimal(self._to_y)
 
     def reset(self) -> Self:
         """Reset the plot.
@@ -203,11 +267,12 @@ class Mandelbrot(Canvas):
             Self.
         """
         self._max_iteration = 80
-        self._multibrot = Decimal(2)
-        self._from_x = Decimal(-2.5)
-        self._to_x = Decimal(1.5)
-        self._from_y = Decimal(-1.5)
-        self._to_y = Decimal(1.5)
+        self._multibrot = 2.0
+        self._from_x = -2.5
+        self._to_x = 1.5
+        self._from_y = -1.5
+        self._to_y = 1.5
+        self._lut = build_lut(self._colour_source, self._max_iteration)
         return self
 
     def set_colour_source(self, colour_source: Callable[[int, int], Color]) -> Self:
@@ -220,59 +285,484 @@ class Mandelbrot(Canvas):
             Self.
         """
         self._colour_source = colour_source
+        self._lut = build_lut(colour_source, self._max_iteration)
         return self.plot()
 
-    def _frange(self, r_from: Decimal, r_to: Decimal, size: int) -> Iterator[Decimal]:
-        """Generate a float range for the plot.
+    def resize_canvas(self, width: int, height: int) -> Self:
+        """Change the size of the canvas that the plot is drawn on.
 
         Args:
-            r_from: The value to generate from.
-            r_to: The value to generate to.
-            size: The size of canvas in the desired direction.
+            width: The new width of the canvas.
+            height: The new height of the canvas.
 
-        Yields:
-            Values between the range to fit the plot.
+        Returns:
+            Self.
+
+        Note:
+            The canvas is cleared; call `plot` to draw the plot again.
+
+            textual-canvas has no way of resizing a canvas, so this works
+            with the canvas' own state; that's why the dependency on
+            textual-canvas is pinned to its 0.2 series.
         """
-        steps = 0
-        step = Decimal(r_to - r_from) / Decimal(size)
-        n = Decimal(r_from)
-        while n < r_to and steps < size:
-            yield n
-            n += step
-            steps += 1
+        self._width = width
+        self._height = height
+        self._the_void = [self._colour for _ in range(width)]
+        self.virtual_size = Size(width, ceil(height / 2))
+        self._axes_view = ()
+        return self.clear()
+
+    def _lines_of(
+        self, escapes: NDArray[np.int32], lut: NDArray[np.object_]
+    ) -> list[Strip] | None:
+        """Turn a grid of escape values into the lines of the display.
 
-    def plot(self) -> Self:
-        """Plot the Mandelbrot set using the current conditions.
+        Args:
+            escapes: The escape values to turn into lines.
+            lut: The lookup table of colours for the escape values.
+
+        Returns:
+            A `Strip` for each line of the display, or `None` if the canvas
+            doesn't make known the character it draws its cells with.
+
+        Note:
+            Each line of the display shows two rows of the grid, one in the
+            top half of each cell and one in the bottom half. Runs of cells
+            that look the same are drawn with a single segment.
+
+            Without the lines, the canvas is left to draw itself.
+        """
+        if not hasattr(self, "_CELL"):
+            return None
+        colours = [*lut.tolist(), self._colour]
+        if len(escapes) % 2:
+            # The bottom half of the last line is off the end of the grid.
+            escapes = np.vstack(
+                (escapes, np.full((1, escapes.shape[1]), len(lut), np.int32))
+            )
+        cells, looks = np.unique(
+            escapes[0::2].astype(np.int64) * len(colours) + escapes[1::2],
+            return_inverse=True,
+        )
+        tops, bottoms = np.divmod(cells, len(colours))
+        # Each colour only needs turning into a Rich colour the once.
+        used = np.union1d(tops, bottoms).tolist()
+        rich = dict(zip(used, (colours[value].rich_color for value in used)))
+        styles = [
+            Style.from_color(rich[bottom], rich[top])
+            for top, bottom in zip(tops.tolist(), bottoms.tolist())
+        ]
+        width = escapes.shape[1]
+        lines: list[Strip] = []
+        for row in looks.reshape(-1, width):
+            starts = [0, *(np.flatnonzero(row[1:] != row[:-1]) + 1).tolist()]
+            lines.append(
+                Strip(
+                    [
+                        Segment(self._CELL * (end - start), styles[row[start]])
+                        for start, end in zip(starts, [*starts[1:], width])
+                    ],
+                    width,
+                )
+            )
+        return lines
+
+    def _paint(
+        self,
+        generation: int,
+        colours: list[list[Color]],
+        lines: list[Strip] | None,
+    ) -> None:
+        """Paint a grid of colours onto the canvas.
+
+        Args:
+            generation: The generation of the plot the colours are from.
+            colours: The rows of colours to paint.
+            lines: The lines of the display that show the colours, if there
+                are any.
+
+        Note:
+            If another plot has been started since the colours were
+            calculated, or the canvas has changed size, they are ignored.
+
+            Rather than setting each pixel in turn, which would have the
+            canvas check and refresh for every single one, the rows of the
+            canvas are replaced wholesale and the canvas refreshed once. The
+            rows are expected to be made ready ahead of time, away from the
+            UI thread, so that this is as quick as it can be. Should the
+            canvas not keep its rows where they can be replaced, the pixels
+            are set a colour at a time instead.
+        """
+        if (
+            generation != self._generation
+            or len(colours) != self.height
+            or any(len(row) != self.width for row in colours)
+        ):
+            return
+        if hasattr(self, "_canvas"):
+            self._canvas[:] = colours
+            self.refresh()
+        else:
+            locations: defaultdict[Color, list[tuple[int, int]]] = defaultdict(list)
+            for y, row in enumerate(colours):
+                for x, colour in enumerate(row):
+                    locations[colour].append((x, y))
+            with self.app.batch_update():
+                for colour, pixels in locations.items():
+                    self.set_pixels(pixels, colour)
+        self._lines = lines
+
+    def set_pixels(self, locations: Iterable[tuple[int, int]], color: Color) -> Self:
+        """Set the colour of a collection of pixels on the canvas.
+
+        Args:
+            locations: An iterable of tuples of x and y location.
+            color: The color to set the pixel to.
+
+        Returns:
+            Self.
+        """
+        self._lines = None
+        return super().set_pixels(locations, color)
+
+    def clear(self, color: Color | None = None) -> Self:
+        """Clear the canvas.
+
+        Args:
+            color: Optional default colour for the canvas.
 
         Returns:
             Self.
         """
+        self._lines = None
+        return super().clear(color)
+
+    def render_line(self, y: int) -> Strip:
+        """Render a line in the display.
+
+        Args:
+            y: The line to render.
+
+        Returns:
+            A `Strip` that is the line to render.
+
+        Note:
+            If the lines showing the plot have been prepared while plotting
+            they are used as they are; otherwise it's left to the canvas to
+            work out the line from its pixels.
+        """
+        scroll_x, scroll_y = self.scroll_offset
+        if self._lines is None or scroll_y + y >= len(self._lines):
+            return super().render_line(y)
+        return self._lines[scroll_y + y].crop(
+            scroll_x, scroll_x + self.scrollable_content_region.width
+        )
+
+    def _remember(self, plot: _Plot, escapes: NDArray[np.int32]) -> None:
+        """Remember the escape values of a plot.
+
+        Args:
+            plot: The details of what was plotted.
+            escapes: The escape values of the plot.
+
+        Note:
+            Only the most recent plots are remembered. The escape values are
+            made read-only, as they may be handed out again later.
+        """
+        escapes.flags.writeable = False
+        self._remembered[plot] = escapes
+        self._remembered.move_to_end(plot)
+        while len(self._remembered) > self._REMEMBERED_PLOTS:
+            self._remembered.popitem(last=False)
+
+    def _plotted(
+        self, generation: int, plot: _Plot, escapes: NDArray[np.int32], elapsed: float
+    ) -> None:
+        """Finish off a plot once it has been painted.
+
+        Args:
+            generation: The generation of the plot.
+            plot: The details of what was plotted.
+            escapes: The escape values of the plot.
+            elapsed: The time taken to calculate the plot.
+
+        Note:
+            If another plot has been started since, this plot was never
+            shown, so it is neither remembered nor announced.
+        """
+        if generation == self._generation:
+            self._remember(plot, escapes)
+            self.post_message(self.Changed(self, elapsed))
+
+    @work(exclusive=True, thread=True, group="plot")
+    def _plot(
+        self,
+        generation: int,
+        plot: _Plot,
+        xs: NDArray[np.floating[Any]],
+        ys: NDArray[np.floating[Any]],
+        lut: NDArray[np.object_],
+        pan: Pan | None,
+    ) -> None:
+        """Plot the Mandelbrot set in the background.
+
+        Args:
+            generation: The generation of the plot.
+            plot: The details of what is being plotted.
+            xs: The x locations of the columns of the plot.
+            ys: The y locations of the rows of the plot.
+            lut: The lookup table of colours for the escape values.
+            pan: The recent plot this plot is a pan of, if it is one.
+
+        Note:
+            If the previous plot was slow to calculate, coarse versions of
+            the plot are calculated and painted first, each one at a finer
+            resolution than the last, so the user isn't left waiting to see
+            something. Each pass only calculates the points the pass before
+            it didn't. The plot gives up early if it's been cancelled, and
+            nothing it has calculated is shown if another plot has been
+            started since.
+
+            If the plot is a pan of a recent plot, only the part of the plot
+            that has come into view is calculated.
+        """
         start = monotonic()
-        with self.app.batch_update():
-            for x_pixel, x_point in enumerate(
-                self._frange(self._from_x, self._to_x, self.width)
+        calculate = escape_grid if escape_grid_ready.is_set() else mandelbrot_grid
+        coarse: NDArray[np.int32] | None = None
+        for step in (
+            (*self._PROGRESSIVE_STEPS, 1) if self._slow and pan is None else (1,)
+        ):
+            step_xs = np.ascontiguousarray(xs[::step])
+            step_ys = np.ascontiguousarray(ys[::step])
+            if pan is not None:
+                escapes = panned_grid(
+                    calculate, xs, ys, plot.multibrot, plot.max_iteration, pan
+                )
+            elif coarse is None:
+                escapes = np.empty((len(step_ys), len(step_xs)), np.int32)
+                mirrored_grid(
+                    calculate,
+                    step_xs,
+                    step_ys,
+                    plot.multibrot,
+                    plot.max_iteration,
+                    escapes,
+                )
+            else:
+                escapes = refined_grid(
+                    calculate,
+                    step_xs,
+                    step_ys,
+                    plot.multibrot,
+                    plot.max_iteration,
+                    coarse,
+                )
+            if get_current_worker().is_cancelled:
+                return
+            coarse = escapes
+            if step > 1:
+                escapes = escapes.repeat(step, axis=0).repeat(step, axis=1)[
+                    : len(ys), : len(xs)
+                ]
+            self.app.call_from_thread(
+                self._paint,
+                generation,
+                lut[escapes].tolist(),
+                self._lines_of(escapes, lut),
+            )
+        elapsed = monotonic() - start
+        if pan is None:
+            self._slow = elapsed > self._PROGRESSIVE_THRESHOLD
+        self.app.call_from_thread(self._plotted, generation, plot, escapes, elapsed)
+
+    def _axes(self) -> tuple[NDArray[np.floating[Any]], NDArray[np.floating[Any]]]:
+        """Get the coordinates of the columns and rows of the plot.
+
+        Returns:
+            A `tuple` of the x locations of the columns and the y locations
+            of the rows.
+
+        Note:
+            The coordinates are only calculated when the view has changed
+            since they were last asked for.
+
+            Where the pixels of the plot are large enough, and there aren't
+            too many iterations for the rounding errors to build up over, the
+            coordinates are single precision.
+        """
+        view = (
+            self._from_x,
+            self._to_x,
+            self._from_y,
+            self._to_y,
+            self._max_iteration,
+        )
+        if view != self._axes_view:
+            precision = (
+                np.float32
+                if (self._to_x - self._from_x) / self.width > SINGLE_PRECISION_LIMIT
+                and self._max_iteration <= SINGLE_PRECISION_ITERATIONS
+                else np.float64
+            )
+            self._axes_cache = (
+                np.linspace(
+                    self._from_x,
+                    self._to_x,
+                    self.width,
+                    endpoint=False,
+                    dtype=precision,
+                ),
+                np.linspace(
+                    self._from_y,
+                    self._to_y,
+                    self.height,
+                    endpoint=False,
+                    dtype=precision,
+                ),
+            )
+            self._axes_view = view
+        return self._axes_cache
+
+    def _recall(self, plot: _Plot) -> _Plot | None:
+        """Find a recent plot that is of the same view as a plot.
+
+        Args:
+            plot: The details of the plot.
+
+        Returns:
+            The details of the recent plot, or `None` if there isn't one.
+
+        Note:
+            Zooming in and back out again doesn't always land exactly back on
+            the same coordinates, so a recent plot whose edges are all within
+            a small fraction of a pixel of the plot's counts as the same.
+        """
+        x_tolerance = ALIGNMENT_TOLERANCE * (plot.to_x - plot.from_x) / plot.width
+        y_tolerance = ALIGNMENT_TOLERANCE * (plot.to_y - plot.from_y) / plot.height
+        for recent in reversed(self._remembered):
+            if (
+                recent[4:] == plot[4:]
+                and abs(recent.from_x - plot.from_x) <= x_tolerance
+                and abs(recent.to_x - plot.to_x) <= x_tolerance
+                and abs(recent.from_y - plot.from_y) <= y_tolerance
+                and abs(recent.to_y - plot.to_y) <= y_tolerance
             ):
-                for y_pixel, y_point in enumerate(
-                    self._frange(self._from_y, self._to_y, self.height)
-                ):
-                    self.set_pixel(
-                        x_pixel,
-                        y_pixel,
-                        self._colour_source(
-                            _mandelbrot(
-                                x_point,
-                                y_point,
-                                float(self._multibrot),
-                                self._max_iteration,
-                            ),
-                            self._max_iteration,
-                        ),
-                    )
-        self.post_message(self.Changed(self, monotonic() - start))
+                return recent
+        return None
+
+    def _pan_from(self, plot: _Plot) -> Pan | None:
+        """Find out if a plot is a pan of the most recent plot.
+
+        Args:
+            plot: The details of the plot.
+
+        Returns:
+            The most recent plot and how far the plot has moved from it, or
+            `None` if the plot isn't a pan of it.
+
+        Note:
+            A plot is only a pan of another if it has moved by a whole number
+            of pixels and the two still overlap.
+        """
+        if not self._remembered or plot.to_x == plot.from_x or plot.to_y == plot.from_y:
+            return None
+        previous, escapes = next(reversed(self._remembered.items()))
+        if previous[4:] != plot[4:] or not (
+            isclose(previous.to_x - previous.from_x, plot.to_x - plot.from_x)
+            and isclose(previous.to_y - previous.from_y, plot.to_y - plot.from_y)
+        ):
+            return None
+        columns = (
+            (plot.from_x - previous.from_x) * plot.width / (plot.to_x - plot.from_x)
+        )
+        rows = (plot.from_y - previous.from_y) * plot.height / (plot.to_y - plot.from_y)
+        if (
+            abs(columns - round(columns)) > ALIGNMENT_TOLERANCE
+            or abs(rows - round(rows)) > ALIGNMENT_TOLERANCE
+            or abs(round(columns)) >= plot.width
+            or abs(round(rows)) >= plot.height
+        ):
+            return None
+        return escapes, round(columns), round(rows)
+
+    def plot(self) -> Self:
+        """Plot the Mandelbrot set using the current conditions.
+
+        Returns:
+            Self.
+
+        Note:
+            The plot is calculated in a background thread. Any plot that is
+            still being calculated when this is called is abandoned.
+
+            If the plot is one of the recent plots, it is painted straight
+            away from the escape values remembered for it. Either way the
+            plot is painted and finished off through the same checks, so a
+            plot that has since been superseded is never shown.
+
+            Any plot that is waiting to happen is taken care of by this plot.
+        """
+        if self._plot_timer is not None:
+            self._plot_timer.stop()
+            self._plot_timer = None
+        if self.width < 1 or self.height < 1:
+            return self
+        self._generation += 1
+        xs, ys = self._axes()
+        plot = _Plot(
+            self._from_x,
+            self._to_x,
+            self._from_y,
+            self._to_y,
+            self.width,
+            self.height,
+            self._multibrot,
+            self._max_iteration,
+            xs.itemsize,
+        )
+        if (recent := self._recall(plot)) is None:
+            self._plot(self._generation, plot, xs, ys, self._lut, self._pan_from(plot))
+        else:
+            start = monotonic()
+            self.workers.cancel_group(self, "plot")
+            escapes = self._remembered[recent]
+            self._paint(
+                self._generation,
+                self._lut[escapes].tolist(),
+                self._lines_of(escapes, self._lut),
+            )
+            self._plotted(self._generation, recent, escapes, monotonic() - start)
         return self
 
+    def _plot_soon(self) -> None:
+        """Plot the Mandelbrot set shortly, gathering up changes until then.
+
+        Note:
+            Any further changes made before the plot happens are taken into
+            it, rather than each of them getting a plot of its own; so, for
+            example, holding down a key doesn't queue up plots of views that
+            will never be seen.
+        """
+        if self._plot_timer is None:
+            self._plot_timer = self.set_timer(self._PLOT_DELAY, self.plot)
+
+    @work(thread=True, group="warm-up")
+    def _warm_up(self) -> None:
+        """Get the compiled kernel ready to use, in the background.
+
+        Note:
+            Compiling the kernel can take a few seconds the very first time
+            around; loading it from Numba's cache after that is quicker, but
+            still not free, and Numba itself takes a while to import. Doing
+            it in the background means the first plot can be drawn straight
+            away, albeit more slowly.
+        """
+        warm_up(self.app.call_from_thread)
+
     def on_mount(self) -> None:
         """Get the plotter going once the DOM is ready."""
+        if not escape_grid_ready.is_set():
+            self._warm_up()
         self.plot()
 
     def action_move(self, x: int, y: int, steps: int = 5) -> None:
@@ -283,65 +773,86 @@ class Mandelbrot(Canvas):
             y: The amount and direction to move in Y.
         """
 
-        x_step = Decimal(x * ((self._to_x - self._from_x) / steps))
-        y_step = Decimal(y * ((self._to_y - self._from_y) / steps))
+        # Move by a whole number of pixels, so that the part of the plot
+        # that stays in view lines up with what's already been calculated.
+        x_step = (
+            x
+            * max(1, round(self.width / steps))
+            * ((self._to_x - self._from_x) / self.width)
+        )
+        y_step = (
+            y
+            * max(1, round(self.height / steps))
+            * ((self._to_y - self._from_y) / self.height)
+        )
 
         self._from_x += x_step
         self._to_x += x_step
         self._from_y += y_step
         self._to_y += y_step
 
-        self.plot()
+        self._plot_soon()
 
     def action_zero(self) -> None:
         """Move the view to 0, 0."""
-        width = (self._to_x - self._from_x) / Decimal(2)
-        height = (self._to_y - self._from_y) / Decimal(2)
+        width = (self._to_x - self._from_x) / 2
+        height = (self._to_y - self._from_y) / 2
         self._from_x = -width
         self._to_x = width
         self._from_y = -height
         self._to_y = height
-        self.plot()
+        self._plot_soon()
 
     @staticmethod
-    def _scale(
-        from_pos: Decimal, to_pos: Decimal, zoom: Decimal
-    ) -> tuple[Decimal, Decimal]:
+    def _scale(from_pos: float, to_pos: float, zoom: float) -> tuple[float, float]:
         """Scale a dimension.
 
         Args:
             from_pos: The start position of the dimension.
             to_pos: The end position of the dimension.
+            zoom: The amount to scale by; negative to shrink the dimension.
 
         Returns:
             The new start and end positions.
         """
+        middle = (from_pos + to_pos) / 2
+        half = ((to_pos - from_pos) / 2) * (1 / -zoom if zoom < 0 else zoom)
+        return middle - half, middle + half
 
-        # Figure the operator from the sign.
-        by = truediv if zoom < 0 else mul
-
-        # We don't need the sign anymore.
-        zoom = Decimal(abs(zoom))
+    @classmethod
+    def _resolvable(cls, from_pos: float, to_pos: float, pixels: int) -> bool:
+        """Can the pixels across a dimension be told apart?
 
-        # Calculate the old and new dimensions.
-        old_dim = to_pos - from_pos
-        new_dim = Decimal(by(old_dim, zoom))
+        Args:
+            from_pos: The start position of the dimension.
+            to_pos: The end position of the dimension.
+            pixels: The number of pixels across the dimension.
 
-        # Return the adjusted points.
-        return (
-            from_pos + Decimal((old_dim - new_dim) / 2),
-            to_pos - Decimal((old_dim - new_dim) / 2),
+        Returns:
+            `True` if each pixel spans enough representable steps.
+        """
+        return (to_pos - from_pos) / max(1, pixels) >= cls._MINIMUM_PIXEL_ULPS * float(
+            np.spacing(max(abs(from_pos), abs(to_pos)))
         )
 
-    def action_zoom(self, zoom: Decimal) -> None:
+    def action_zoom(self, zoom: float) -> None:
         """Zoom in our out.
 
         Args:
             zoom: The amount to zoom by.
         """
-        self._from_x, self._to_x = self._scale(self._from_x, self._to_x, zoom)
-        self._from_y, self._to_y = self._scale(self._from_y, self._to_y, zoom)
-        self.plot()
+        from_x, to_x = self._scale(self._from_x, self._to_x, zoom)
+        from_y, to_y = self._scale(self._from_y, self._to_y, zoom)
+        # Don't zoom in so far that the pixels can't be told apart.
+        if zoom < 0 and not (
+            self._resolvable(from_x, to_x, self.width)
+            and self._resolvable(from_y, to_y, self.height)
+        ):
+            self.app.bell()
+            return
+        self._from_x, self._to_x = from_x, to_x
+        self._from_y, self._to_y = from_y, to_y
+        self._plot_soon()
 
     def action_max_iter(self, change: int) -> None:
         """Change the maximum number of iterations for a calculation.
@@ -349,22 +860,30 @@ class Mandelbrot(Canvas):
         Args:
             change: The amount to change by.
         """
+        if not change:
+            return
         # Keep a lower bound for the max iteration.
         if (self._max_iteration + change) >= 10:
             self._max_iteration += change
-            self.plot()
+            self._lut = build_lut(self._colour_source, self._max_iteration)
+            self._plot_soon()
         else:
             self.app.bell()
 
-    def action_multibrot(self, change: Decimal) -> None:
+    def action_multibrot(self, change: float) -> None:
         """Change the 'multibrot' modifier.
 
         Args:
             change: The amount to change by.
         """
-        if (self._multibrot + Decimal(change)) > 0:
-            self._multibrot += Decimal(change)
-            self.plot()
+        # Round off the error that creeps in when stepping by fractions, so
+        # that stepping back lands exactly on whole values again.
+        multibrot = round(self._multibrot + change, 10)
+        if multibrot == self._multibrot:
+            return
+        if multibrot > 0:
+            self._multibrot = multibrot
+            self._plot_soon()
         else:
             self.app.bell()
 